@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import subprocess
+
+# 使い方
+USAGE_TEXT = """Usage: benchmark_import.py [budget_ms]
+Measures the time to import each module in a new interpreter
+and fails if it exceeds the budget (default: 40 ms)."""
+
+# 計測対象のモジュール (起動回数の多いコマンドとライブラリとしての利用)
+MODULES = ['visualization', 'differences', 'reachability', 'shard']
+
+# import 時に読み込まれてはならない重い依存関係
+HEAVY_MODULES = ['lxml', 'graphviz']
+
+IMPORT_TIME_BUDGET = 40 # ms: インタプリタの起動時間を除いた import の時間
+REPEAT = 10
+
+
+def run_python(statement):
+    """Runs a statement in a new interpreter and returns the elapsed time and the output.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', statement], check=True,
+                            capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.perf_counter() - start, result.stdout.strip()
+
+def measure(statement):
+    """Returns the minimum elapsed time of `REPEAT` runs in milliseconds.
+    """
+    return min(run_python(statement)[0] for _ in range(REPEAT)) * 1000
+
+def main():
+    if len(sys.argv) > 2:
+        print(USAGE_TEXT)
+        return
+    budget = float(sys.argv[1]) if len(sys.argv) == 2 else IMPORT_TIME_BUDGET
+
+    failed = False
+    startup = measure('pass')
+    print("interpreter startup: %.1f ms" % startup)
+    for module in MODULES:
+        import_time = measure('import ' + module) - startup
+        _, loaded = run_python('import sys, ' + module + '; print(",".join(m for m in ' + repr(HEAVY_MODULES) +
+                               ' if m in sys.modules))')
+        status = "ok"
+        if import_time > budget:
+            status = "over budget"
+            failed = True
+        if loaded:
+            status = "imports " + loaded
+            failed = True
+        print("%s: %.1f ms (%s)" % (module, import_time, status))
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
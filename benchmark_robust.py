@@ -0,0 +1,77 @@
+import os
+import sys
+import csv
+import time
+import tempfile
+from visualization import RosGraph, Remap, ExtractionLimits, write_errors, find_files, CPP_FILES, XML_FILES, PYTHON_FILES
+
+# 使い方
+USAGE_TEXT = """Usage: benchmark_robust.py
+Checks that the robust mode stops pathological files within the time budget
+and records them in errors.csv."""
+
+TIME_BUDGET = 0.1 # 秒: 計測用の1ファイルあたりの処理時間の上限
+TIME_MARGIN = 1.0 # 秒: 1ファイルあたりに許容する超過時間
+
+# 一致する箇所がなく，正規表現が長い範囲を探索するファイル
+PATHOLOGICAL_FILES = {
+    'src/unterminated.cpp': 'x.advertise(' * 80000,
+    'launch/unterminated.launch.py': 'ComposableNode(' * 66000,
+}
+
+# 壊れたファイルを include する launch ファイル
+BROKEN_INCLUDE_FILES = {
+    'launch/parent.launch.xml': '<launch><include file="$(find-pkg-share a)/launch/broken.launch.xml"/></launch>',
+    'other/launch/broken.launch.xml': '<launch><node pkg="x"',
+}
+
+
+def write_files(root, files):
+    for name, text in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding="utf-8") as file:
+            file.write(text)
+
+def main():
+    if len(sys.argv) != 1:
+        print(USAGE_TEXT)
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        write_files(root, PATHOLOGICAL_FILES)
+        write_files(root, BROKEN_INCLUDE_FILES)
+
+        limits = ExtractionLimits(time_budget=TIME_BUDGET)
+        start = time.perf_counter()
+        model = RosGraph(find_files(root, CPP_FILES), limits)
+        remaps = Remap(find_files(root, XML_FILES), find_files(root, PYTHON_FILES), root, limits)
+        elapsed = time.perf_counter() - start
+        write_errors(model, remaps, root)
+
+        with open(os.path.join(root, "errors.csv"), encoding="utf-8") as file:
+            errors = {os.path.relpath(row[0], root): row[1] for row in list(csv.reader(file))[1:]}
+
+    failed = False
+    expected = {name: "time budget exceeded" for name in PATHOLOGICAL_FILES}
+    expected['launch/parent.launch.xml'] = "included file"
+    for name, reason in expected.items():
+        status = "ok"
+        if name not in errors:
+            status = "not recorded in errors.csv"
+            failed = True
+        elif reason not in errors[name]:
+            status = "unexpected reason: " + errors[name]
+            failed = True
+        print("%s: %s" % (name, status))
+
+    limit = len(PATHOLOGICAL_FILES) * (TIME_BUDGET + TIME_MARGIN)
+    print("elapsed: %.2f s (limit %.2f s)" % (elapsed, limit))
+    if elapsed > limit:
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
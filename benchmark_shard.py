@@ -0,0 +1,109 @@
+import os
+import sys
+import shutil
+import filecmp
+import tempfile
+import subprocess
+
+# 使い方
+USAGE_TEXT = """Usage: benchmark_shard.py
+Checks that shards extracted per package with different path spellings
+are merged into the same outputs as visualization.py run on the whole workspace."""
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+EXCLUSION = 'sink'
+
+# パッケージをまたぐ include と引数，python の launch ファイルを含むワークスペース
+WORKSPACE_FILES = {
+    'pkg_a/src/talker.cpp': 'void f(){ auto p = n.advertise<X>("chatter", 10); auto s = n.subscribe("loop_back", 1, cb); }',
+    'pkg_a/launch/a.launch.xml': '<launch><arg name="out" default="chatter2"/>'
+                                 '<node pkg="talker" exec="talker"><remap from="chatter" to="$(var out)"/></node></launch>',
+    'pkg_b/src/listener.cpp': 'void f(){ auto s = n.subscribe("chatter2", 10, cb); auto p = n->create_publisher<X>("relay", 1); }',
+    'pkg_b/launch/b.launch.xml': '<launch><arg name="out" default="/renamed"/>'
+                                 '<node pkg="listener" exec="listener"><remap from="relay" to="$(var out)"/></node>'
+                                 '<include file="$(find-pkg-share pkg_c)/launch/c.launch.xml">'
+                                 '<arg name="inp" value="/renamed"/></include></launch>',
+    'pkg_b/launch/b.launch.py': 'def generate_launch_description():\n'
+                                '    return LaunchDescription([Node(package="b", name="listener", '
+                                'remappings=[("result", "result_r"), ("x", LaunchConfiguration("y"))])])\n',
+    'pkg_c/src/sink.cpp': 'void f(){ s = node->create_subscription<X>("remapped_in", 1, cb); '
+                          'p = node->create_publisher<X>("loop_back", 10); }',
+    'pkg_c/launch/c.launch.xml': '<launch><arg name="inp" default="x"/>'
+                                 '<node pkg="sink" exec="sink"><remap from="remapped_in" to="$(var inp)"/></node></launch>',
+    'pkg_c/launch/c.launch.py': 'ld = [Node(package="x", name="sink", remappings=[("loop_back", "/lb2")])]\n',
+}
+
+# --robust 指定時のみ解析できる (スキップされる) ファイル
+BROKEN_FILES = {
+    'pkg_a/src/latin1.cpp': 'n.advertise<X>("caf\xe9", 1);'.encode('latin-1'),
+    'pkg_a/launch/parent.launch.xml': '<launch><include file="$(find-pkg-share pkg_c)/launch/broken.launch.xml"/></launch>',
+    'pkg_c/launch/broken.launch.xml': '<launch><node pkg="x"',
+}
+
+
+def write_files(root, files):
+    for name, text in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(text, bytes):
+            with open(path, 'wb') as file:
+                file.write(text)
+        else:
+            with open(path, 'w', encoding="utf-8") as file:
+                file.write(text)
+
+def run_script(root, script, args):
+    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, script)] + args,
+                   check=True, cwd=root, stdout=subprocess.DEVNULL)
+
+def compare(root, files, robust):
+    """Runs visualization.py and shard.py on a workspace and returns a list of differing outputs.
+    """
+    workspace = os.path.join(root, 'ws')
+    write_files(workspace, files)
+    options = ['--robust'] if robust else []
+    render = ['--csv'] if shutil.which('dot') is None else []
+
+    # 統合結果と同じく，ワークスペースは相対パスで与える
+    run_script(root, 'visualization.py', options + render + ['ws', 'full', EXCLUSION])
+
+    # パッケージごとにパスの書き方を変えて抽出する (pkg_c/launch は重複する部分結果)
+    extractions = [(workspace, os.path.join(workspace, 'pkg_a')),
+                   ('ws', 'ws/pkg_b/'),
+                   ('./ws/../ws', os.path.join(workspace, 'pkg_c')),
+                   ('ws', os.path.join(workspace, 'pkg_c', 'launch'))]
+    shard_files = list()
+    for number, (workspace_dir, input_dir) in enumerate(extractions):
+        shard_file = 'shard' + str(number) + '.json'
+        run_script(root, 'shard.py', ['extract'] + options + [workspace_dir, input_dir, shard_file])
+        shard_files.append(shard_file)
+    run_script(root, 'shard.py', ['merge'] + render + ['ws', 'merged'] + shard_files + ['--filter=' + EXCLUSION])
+
+    full = os.path.join(root, 'full')
+    merged = os.path.join(root, 'merged')
+    names = sorted(set(os.listdir(full)) | set(os.listdir(merged)))
+    _, mismatch, missing = filecmp.cmpfiles(full, merged, names, shallow=False)
+    return sorted(mismatch + missing)
+
+def main():
+    if len(sys.argv) != 1:
+        print(USAGE_TEXT)
+        return
+
+    failed = False
+    scenarios = [('default', WORKSPACE_FILES, False),
+                 ('robust', dict(WORKSPACE_FILES, **BROKEN_FILES), True)]
+    for name, files, robust in scenarios:
+        with tempfile.TemporaryDirectory() as root:
+            differences = compare(root, files, robust)
+        status = "ok"
+        if differences:
+            status = "outputs differ: " + ", ".join(differences)
+            failed = True
+        print("%s: %s" % (name, status))
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,13 @@
 import sys
 import copy
 import csv
-from graphviz import Digraph
 
-dg = Digraph(format='png')
-dg.attr(rankdir='LR')
-call = 0
-dp_topic_sub = [[]]
+def draw_design(dg, judge, lst, dp_topic_sub):
+    """Adds a connection (publisher, topic, subscribers...) to the graph.
 
-def draw_design(judge, lst):
-    
-    global call
+    `dp_topic_sub` is a set of (topic, subscriber) pairs already drawn,
+    which is shared among calls for a graph.
+    """
     lst_count = 0
     dp_flag = 0
 
@@ -43,12 +40,9 @@ def draw_design(judge, lst):
                     dg.attr('node', shape='circle')
                     dg.node(sub, penwidth="3", color = '#d9534f')
 
-            if call > 0:
-                for topic_sub in dp_topic_sub:
-                    if topic_sub[0] == topic and topic_sub[1] == sub:
-                        dp_flag = 1
-            dp_topic_sub.append([topic,sub])
-            call += 1
+            if (topic, sub) in dp_topic_sub:
+                dp_flag = 1
+            dp_topic_sub.add((topic, sub))
 
         if lst_count == 1:
             if judge == 'same':
@@ -63,10 +57,13 @@ def draw_design(judge, lst):
 
         lst_count += 1
         dp_flag = 0
-        if call == 1 and lst_count > 1:
-            del(dp_topic_sub[0])
 
 def diff():
+    from graphviz import Digraph
+
+    dg = Digraph(format='png')
+    dg.attr(rankdir='LR')
+    dp_topic_sub = set()
 
     try:
         new_file_path = sys.argv[1]
@@ -91,13 +88,13 @@ def diff():
     for new_connection in copy_new_data:
         for past_connection in copy_past_data:
             if new_connection == past_connection:
-                draw_design('same', new_connection)
+                draw_design(dg, 'same', new_connection, dp_topic_sub)
                 past_data.remove(past_connection)
                 new_data.remove(new_connection)
     
     if len(new_data) != 0:
         for new_connection in new_data:
-            draw_design('new', new_connection)
+            draw_design(dg, 'new', new_connection, dp_topic_sub)
 
     new_file.close
     past_file.close
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import stat
+import signal
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from visualization import RosGraph, Remap, apply_remaps, find_files, CPP_FILES, XML_FILES, PYTHON_FILES
+from reachability import ReachabilityGraph
+
+# 使い方
+USAGE_TEXT = """Usage: graph_server.py [--closure] cpp_file_dir [port|socket_path]
+The graph is analyzed once and queries are answered over HTTP.
+A number is a TCP port on localhost (default: 8765), and others are a Unix socket path.
+--closure precomputes the transitive closure for upstream/downstream queries.
+It uses memory quadratic in the number of nodes."""
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class GraphIndex:
+    """
+    In-memory indexes of a data-flow graph for answering queries.
+
+    Attributes `publishers` and `subscribers` map a topic to a set of node names.
+    Attributes `published` and `subscribed` map a node name to a set of topics.
+    Attributes `downstream` and `upstream` map a node name to a set of adjacent node names
+    connected through a topic.
+    Attribute `reachability` answers multi-hop queries.
+    If `closure` is enabled, it precomputes the transitive closure.
+    Remap rules are applied in the same way as `make_output_list`.
+    """
+
+    def __init__(self, model, remaps, closure=False):
+        self.nodes = set(node.name for node in model.nodes)
+        self.publishers = dict()
+        self.subscribers = dict()
+        self.published = dict()
+        self.subscribed = dict()
+        self.downstream = dict()
+        self.upstream = dict()
+
+        pub_list, sub_list = apply_remaps(model, remaps)
+        for node_name, topic in pub_list:
+            self.publishers.setdefault(topic, set()).add(node_name)
+            self.published.setdefault(node_name, set()).add(topic)
+        for topic, node_name in sub_list:
+            self.subscribers.setdefault(topic, set()).add(node_name)
+            self.subscribed.setdefault(node_name, set()).add(topic)
+
+        for topic, pubs in self.publishers.items():
+            for sub in self.subscribers.get(topic, ()):
+                for pub in pubs:
+                    self.downstream.setdefault(pub, set()).add(sub)
+                    self.upstream.setdefault(sub, set()).add(pub)
+
+        self.reachability = ReachabilityGraph(self.connections(), closure)
+
+    def connections(self):
+        """Returns connection rows (publisher, topic, subscribers...) built from the indexes."""
+        rows = list()
+        for topic in sorted(self.publishers):
+            subs = sorted(self.subscribers.get(topic, ()))
+            if subs:
+                for pub in sorted(self.publishers[topic]):
+                    rows.append([pub, topic] + subs)
+        return rows
+
+    def topic_publishers(self, topic):
+        """Returns a sorted list of nodes publishing the topic."""
+        return sorted(self.publishers.get(topic, ()))
+
+    def topic_subscribers(self, topic):
+        """Returns a sorted list of nodes subscribing the topic."""
+        return sorted(self.subscribers.get(topic, ()))
+
+    def fan_out(self, node_name):
+        """Returns topics published by the node and nodes directly receiving them."""
+        return {'topics': sorted(self.published.get(node_name, ())),
+                'nodes': sorted(self.downstream.get(node_name, ()))}
+
+    def fan_in(self, node_name):
+        """Returns topics subscribed by the node and nodes directly sending them."""
+        return {'topics': sorted(self.subscribed.get(node_name, ())),
+                'nodes': sorted(self.upstream.get(node_name, ()))}
+
+    def orphan_topics(self):
+        """Returns topics that have no subscribers and topics that have no publishers."""
+        return {'unsubscribed': sorted(self.publishers.keys() - self.subscribers.keys()),
+                'unpublished': sorted(self.subscribers.keys() - self.publishers.keys())}
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    Answers a query as a JSON document.
+
+    `/publishers?topic=T`, `/subscribers?topic=T`,
+    `/fanout?node=N`, `/fanin?node=N`, `/downstream?node=N`, `/upstream?node=N`,
+    `/path?from=N&to=M` and `/orphans` are available.
+    `/downstream` and `/upstream` return the reached nodes and
+    the edges [publisher, topic, subscriber] among them.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        status, result = self.answer(url.path, params)
+        body = json.dumps(result).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def answer(self, path, params):
+        index = self.server.index
+        if path == '/orphans':
+            return 200, index.orphan_topics()
+
+        if path in ('/publishers', '/subscribers'):
+            if 'topic' not in params:
+                return 400, {'error': 'parameter "topic" is required'}
+            topic = params['topic'][0]
+            if path == '/publishers':
+                return 200, index.topic_publishers(topic)
+            return 200, index.topic_subscribers(topic)
+
+        if path == '/path':
+            if 'from' not in params or 'to' not in params:
+                return 400, {'error': 'parameters "from" and "to" are required'}
+            for node_name in (params['from'][0], params['to'][0]):
+                if node_name not in index.nodes:
+                    return 404, {'error': 'unknown node: ' + node_name}
+            return 200, index.reachability.shortest_path(params['from'][0], params['to'][0])
+
+        if path in ('/fanout', '/fanin', '/downstream', '/upstream'):
+            if 'node' not in params:
+                return 400, {'error': 'parameter "node" is required'}
+            node_name = params['node'][0]
+            if node_name not in index.nodes:
+                return 404, {'error': 'unknown node: ' + node_name}
+            if path == '/fanout':
+                return 200, index.fan_out(node_name)
+            elif path == '/fanin':
+                return 200, index.fan_in(node_name)
+            elif path == '/downstream':
+                return 200, {'nodes': index.reachability.downstream(node_name),
+                             'edges': index.reachability.downstream_edges(node_name)}
+            return 200, {'nodes': index.reachability.upstream(node_name),
+                         'edges': index.reachability.upstream_edges(node_name)}
+
+        return 404, {'error': 'unknown query: ' + path}
+
+    def log_message(self, format, *args):
+        # 問い合わせごとのログは出力しない
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def build_index(input_dir, closure=False):
+    """Analyzes the source files under the directory and returns a GraphIndex."""
+    model = RosGraph(find_files(input_dir, CPP_FILES))
+    remaps = Remap(find_files(input_dir, XML_FILES), find_files(input_dir, PYTHON_FILES), input_dir)
+    return GraphIndex(model, remaps, closure)
+
+
+def stop_server(signum, frame):
+    """Stops the server on SIGTERM in the same way as Ctrl-C."""
+    raise KeyboardInterrupt
+
+def main():
+    closure = '--closure' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--closure']
+    if len(args) < 1 or len(args) > 2:
+        print(USAGE_TEXT)
+        return
+
+    address = args[1] if len(args) == 2 else str(DEFAULT_PORT)
+    use_socket = not address.isdigit()
+    # 既存のファイルはソケットの場合のみ削除する (パスの打ち間違いで通常のファイルを消さないため)
+    if use_socket and os.path.lexists(address):
+        if not stat.S_ISSOCK(os.lstat(address).st_mode):
+            print("Error: " + address + " exists and is not a socket.")
+            return
+        os.remove(address)
+
+    index = build_index(args[0], closure)
+
+    if use_socket:
+        server = UnixHTTPServer(address, QueryHandler)
+        print("Listening on " + address)
+    else:
+        server = ThreadingHTTPServer((HOST, int(address)), QueryHandler)
+        print("Listening on http://" + HOST + ":" + address)
+    server.index = index
+
+    signal.signal(signal.SIGTERM, stop_server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if use_socket and os.path.lexists(address) and stat.S_ISSOCK(os.lstat(address).st_mode):
+            os.remove(address)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import sys
+import csv
+from collections import deque
+
+# 使い方
+USAGE_TEXT = """Usage: reachability.py connection.csv query [node] [node]
+query is one of:
+  downstream node        nodes affected by the node
+  upstream node          nodes affecting the node
+  downstream-edges node  edges (publisher,topic,subscriber) through which the node affects others
+  upstream-edges node    edges (publisher,topic,subscriber) through which others affect the node
+  path node node         shortest path (node, topic, node, ...) between the nodes
+  scc                    strongly connected components including two or more nodes"""
+
+
+def read_connections(path):
+    """Reads connection rows (publisher, topic, subscribers...) from a csv file
+    written by visualization.py.
+    """
+    with open(path, encoding="utf-8") as file:
+        return [row for row in csv.reader(file)]
+
+
+def strongly_connected_components(adjacency):
+    """Computes strongly connected components of a graph by Tarjan's algorithm.
+
+    The algorithm is implemented without recursion to handle large graphs.
+
+    :param adjacency: A list of successor lists. Vertices are integers.
+    :returns: A pair of a component id list for vertices and a list of components.
+        Each component is a list of vertices.
+        Components are ordered in reverse topological order,
+        i.e. a component appears after all components reachable from it.
+    """
+    size = len(adjacency)
+    index = [-1] * size
+    low = [0] * size
+    on_stack = [False] * size
+    component_of = [-1] * size
+    components = list()
+    stack = list()
+    counter = 0
+
+    for root in range(size):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            vertex, position = work[-1]
+            if position < len(adjacency[vertex]):
+                work[-1] = (vertex, position + 1)
+                successor = adjacency[vertex][position]
+                if index[successor] == -1:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, 0))
+                elif on_stack[successor]:
+                    low[vertex] = min(low[vertex], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[vertex])
+                if low[vertex] == index[vertex]:
+                    members = list()
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        members.append(member)
+                        if member == vertex:
+                            break
+                    components.append(members)
+    return component_of, components
+
+
+class ReachabilityGraph:
+    """
+    A node-level data-flow graph for multi-hop reachability queries.
+
+    An edge from a publisher to a subscriber is labeled with the topics connecting them.
+    Attribute `components` is a list of strongly connected components (lists of node ids)
+    and `dag` is a list of successor component sets of the condensed DAG.
+    If `closure` is enabled, the transitive closure of the DAG is precomputed
+    as bitsets so that a query does not traverse the graph.
+    """
+
+    def __init__(self, connections, closure=False):
+        """Create a graph from connection rows (publisher, topic, subscribers...)
+        """
+        self.names = list()
+        self.ids = dict()
+        self.successors = list()
+        self.labels = dict() # (publisher id, subscriber id) -> set of topics
+
+        for connection in connections:
+            if len(connection) < 3:
+                continue
+            pub = self.get_id(connection[0])
+            for sub_name in connection[2:]:
+                if sub_name == '':
+                    continue
+                sub = self.get_id(sub_name)
+                edge = (pub, sub)
+                if edge not in self.labels:
+                    self.labels[edge] = set()
+                    self.successors[pub].append(sub)
+                self.labels[edge].add(connection[1])
+
+        self.component_of, self.components = strongly_connected_components(self.successors)
+        self.dag = [set() for _ in self.components]
+        self.reverse_dag = [set() for _ in self.components]
+        for (pub, sub) in self.labels:
+            pub_component = self.component_of[pub]
+            sub_component = self.component_of[sub]
+            if pub_component != sub_component:
+                self.dag[pub_component].add(sub_component)
+                self.reverse_dag[sub_component].add(pub_component)
+
+        self.downstream_bits = None
+        self.upstream_bits = None
+        if closure:
+            self.compute_closure()
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def get_id(self, name):
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.successors.append(list())
+        return self.ids[name]
+
+    def compute_closure(self):
+        """Computes reachable components of every component as bitsets.
+
+        Components are in reverse topological order,
+        so successors of a component are always computed before the component.
+        """
+        self.downstream_bits = [0] * len(self.components)
+        for component in range(len(self.components)):
+            bits = 1 << component
+            for successor in self.dag[component]:
+                bits |= self.downstream_bits[successor]
+            self.downstream_bits[component] = bits
+
+        self.upstream_bits = [0] * len(self.components)
+        for component in reversed(range(len(self.components))):
+            bits = 1 << component
+            for predecessor in self.reverse_dag[component]:
+                bits |= self.upstream_bits[predecessor]
+            self.upstream_bits[component] = bits
+
+    def reachable_components(self, component, dag, closure_bits):
+        if closure_bits is not None:
+            # ビット列を下位ビットから並べた文字列で走査する (整数のコピーを繰り返さない)
+            digits = bin(closure_bits[component])[:1:-1]
+            reached = list()
+            position = digits.find('1')
+            while position != -1:
+                reached.append(position)
+                position = digits.find('1', position + 1)
+            return reached
+
+        reached = [component]
+        visited = {component}
+        for current in reached:
+            for next_component in dag[current]:
+                if next_component not in visited:
+                    visited.add(next_component)
+                    reached.append(next_component)
+        return reached
+
+    def reachable_ids(self, name, dag, closure_bits):
+        if name not in self.ids:
+            return list()
+        node = self.ids[name]
+        result = list()
+        for component in self.reachable_components(self.component_of[node], dag, closure_bits):
+            result.extend(self.components[component])
+        return result
+
+    def reachable(self, name, dag, closure_bits):
+        return sorted(self.names[member] for member in self.reachable_ids(name, dag, closure_bits)
+                      if self.names[member] != name)
+
+    def edges_within(self, members):
+        """Returns sorted triples [publisher, topic, subscriber] of edges between the nodes.
+        """
+        members = set(members)
+        edges = list()
+        for pub in members:
+            for sub in self.successors[pub]:
+                if sub in members:
+                    for topic in self.labels[(pub, sub)]:
+                        edges.append([self.names[pub], topic, self.names[sub]])
+        return sorted(edges)
+
+    def downstream(self, name):
+        """Returns a sorted list of nodes reachable from the node (excluding the node itself).
+        """
+        return self.reachable(name, self.dag, self.downstream_bits)
+
+    def upstream(self, name):
+        """Returns a sorted list of nodes that can reach the node (excluding the node itself).
+        """
+        return self.reachable(name, self.reverse_dag, self.upstream_bits)
+
+    def downstream_edges(self, name):
+        """Returns edges [publisher, topic, subscriber] through which the node affects downstream nodes.
+        """
+        return self.edges_within(self.reachable_ids(name, self.dag, self.downstream_bits))
+
+    def upstream_edges(self, name):
+        """Returns edges [publisher, topic, subscriber] through which upstream nodes affect the node.
+        """
+        return self.edges_within(self.reachable_ids(name, self.reverse_dag, self.upstream_bits))
+
+    def shortest_path(self, source, target):
+        """Returns a shortest data-flow path between two nodes.
+
+        :returns: A list alternating node names and topics, e.g. [node, topic, node],
+            or None if the target is not reachable.
+            If several topics connect two nodes, the smallest topic name is shown.
+        """
+        if source not in self.ids or target not in self.ids:
+            return None
+        start = self.ids[source]
+        goal = self.ids[target]
+        if start == goal:
+            return [source]
+        if self.downstream_bits is not None:
+            target_bit = 1 << self.component_of[goal]
+            if not self.downstream_bits[self.component_of[start]] & target_bit:
+                return None
+
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for successor in self.successors[current]:
+                if successor in parent:
+                    continue
+                parent[successor] = current
+                if successor == goal:
+                    path = [self.names[goal]]
+                    node = goal
+                    while parent[node] is not None:
+                        path.append(min(self.labels[(parent[node], node)]))
+                        path.append(self.names[parent[node]])
+                        node = parent[node]
+                    path.reverse()
+                    return path
+                queue.append(successor)
+        return None
+
+    def cycles(self):
+        """Returns strongly connected components including two or more nodes
+        as sorted lists of node names.
+        """
+        return [sorted(self.names[member] for member in component)
+                for component in self.components if len(component) > 1]
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(USAGE_TEXT)
+        return
+
+    query = sys.argv[2]
+    arity = {'downstream': 1, 'upstream': 1, 'downstream-edges': 1, 'upstream-edges': 1, 'path': 2, 'scc': 0}
+    if query not in arity or len(sys.argv) != 3 + arity[query]:
+        print(USAGE_TEXT)
+        return
+
+    graph = ReachabilityGraph(read_connections(sys.argv[1]))
+    for name in sys.argv[3:]:
+        if name not in graph:
+            print("Error: " + name + " is not a node in the graph.")
+            return
+
+    if query == 'downstream':
+        result = graph.downstream(sys.argv[3])
+    elif query == 'upstream':
+        result = graph.upstream(sys.argv[3])
+    elif query in ('downstream-edges', 'upstream-edges'):
+        if query == 'downstream-edges':
+            edges = graph.downstream_edges(sys.argv[3])
+        else:
+            edges = graph.upstream_edges(sys.argv[3])
+        csv.writer(sys.stdout, lineterminator='\n').writerows(edges)
+        return
+    elif query == 'path':
+        path = graph.shortest_path(sys.argv[3], sys.argv[4])
+        result = [' -> '.join(path)] if path else []
+    else:
+        result = [','.join(component) for component in graph.cycles()]
+
+    for line in result:
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+from pathlib import Path
+from visualization import (RosGraph, Remap, Node, ExtractionLimits, IncludeError, find_files, error_reason,
+                           make_output_dir, write_outputs, CPP_FILES, XML_FILES, PYTHON_FILES)
+
+# 使い方
+USAGE_TEXT = """Usage: shard.py extract [--robust] workspace_dir cpp_file_dir shard_file
+       shard.py merge [--csv] workspace_dir output_dir shard_file... [--filter=names]
+extract writes a partial result of the files under cpp_file_dir, a subtree of workspace_dir.
+workspace_dir is searched for launch files included by other launch files,
+and file paths are recorded relative to it.
+merge combines shards and writes the same outputs as visualization.py run on workspace_dir.
+[names] is a comma-separated list of node names excluded from the graph.
+--csv writes only the csv files without rendering the graph."""
+
+SHARD_VERSION = 3
+
+
+def relative_path(path, workspace_dir):
+    """Returns a path relative to the workspace, independent of how the paths are spelled.
+    """
+    return Path(os.path.abspath(path)).relative_to(os.path.abspath(workspace_dir)).as_posix()
+
+
+def extract_shard(input_dir, workspace_dir, limits=None):
+    """Analyzes the files under a directory and returns a partial result.
+
+    Remap rules are recorded for each launch file,
+    so that the rules of all shards can be ordered in the same way as a single run.
+    File paths are recorded relative to the workspace,
+    including included files named in the reasons of errors.
+
+    :param input_dir: A subtree of the workspace to be analyzed.
+    :param workspace_dir: The root of the workspace, also searched for included launch files.
+    :param limits: ExtractionLimits for the robust mode, or None.
+    :returns: A dictionary that can be serialized as JSON.
+    :raises ValueError: If input_dir is not in the workspace.
+    """
+    relative_path(input_dir, workspace_dir)
+
+    model = RosGraph(find_files(input_dir, CPP_FILES), limits)
+    nodes = list()
+    for node in model.nodes:
+        file_name = relative_path(node.file_name, workspace_dir)
+        nodes.append({'file': file_name,
+                      'publishing_topics': sorted(node.publishing_topics),
+                      'subscribing_topics': sorted(node.subscribing_topics),
+                      'locations': [[file_name] + location[1:] for location in node.locations]})
+
+    launch_files = {'xml': list(), 'python': list()}
+    for kind, pattern in (('xml', XML_FILES), ('python', PYTHON_FILES)):
+        for path in find_files(input_dir, pattern):
+            if kind == 'xml':
+                remaps = Remap([path], [], workspace_dir, limits)
+            else:
+                remaps = Remap([], [path], workspace_dir, limits)
+            file_name = relative_path(path, workspace_dir)
+            rules = [[str(element) for element in rule] for rule in remaps.remap_rule_lst]
+            if kind == 'python':
+                # python の launch ファイルの規則は出典としてファイルのパスを持つ
+                rules = [rule[:3] + [file_name] for rule in rules]
+            errors = list()
+            for error_file, reason in remaps.errors:
+                if error_file in remaps.include_errors:
+                    # include 先のパスは理由の文字列に埋め込まず，統合時に組み立て直す
+                    error = remaps.include_errors[error_file]
+                    errors.append({'included_file': relative_path(error.included_file, workspace_dir),
+                                   'reason': error.reason})
+                else:
+                    errors.append({'reason': reason})
+            launch_files[kind].append({'file': file_name,
+                                       'rules': rules,
+                                       'errors': errors})
+
+    return {'version': SHARD_VERSION,
+            'robust': limits is not None,
+            'nodes': nodes,
+            'node_errors': [[relative_path(file_name, workspace_dir), reason] for file_name, reason in model.errors],
+            'launch_files': launch_files}
+
+
+def merge_shards(shards, workspace_dir):
+    """Combines partial results into a RosGraph and a Remap.
+
+    File paths are restored under `workspace_dir` and ordered as `find_files` does,
+    so the result is identical to a single run over the whole workspace.
+    A file included in two or more shards is used only once.
+
+    :param shards: A list of dictionaries returned by `extract_shard`.
+    :param workspace_dir: The workspace path as it should appear in the outputs.
+    :returns: A pair of a RosGraph instance and a Remap instance.
+    :raises ValueError: If the shards have different versions or robust modes.
+    """
+    def full_path(file_name):
+        return str(Path(workspace_dir) / file_name)
+
+    def launch_error(error):
+        if 'included_file' in error:
+            return error_reason(IncludeError(full_path(error['included_file']), error['reason']))
+        return error['reason']
+
+    node_records = dict()
+    node_errors = dict()
+    launch_records = {'xml': dict(), 'python': dict()}
+    for shard in shards:
+        if shard.get('version') != SHARD_VERSION:
+            raise ValueError("unsupported shard version: " + str(shard.get('version')))
+        if shard['robust'] != shards[0]['robust']:
+            raise ValueError("shards extracted with and without --robust cannot be merged")
+        for record in shard['nodes']:
+            node_records.setdefault(record['file'], record)
+        for file_name, reason in shard['node_errors']:
+            node_errors.setdefault(file_name, reason)
+        for kind in launch_records:
+            for record in shard['launch_files'][kind]:
+                launch_records[kind].setdefault(record['file'], record)
+
+    model = RosGraph([])
+    for file_name in sorted(node_records, key=Path):
+        record = node_records[file_name]
+        locations = [[full_path(file_name)] + location[1:] for location in record['locations']]
+        model.add_node(Node.from_record(full_path(file_name), record['publishing_topics'],
+                                        record['subscribing_topics'], locations))
+    model.errors = [[full_path(file_name), node_errors[file_name]] for file_name in sorted(node_errors, key=Path)]
+
+    remaps = Remap([], [], None)
+    for kind in ('xml', 'python'):
+        for file_name in sorted(launch_records[kind], key=Path):
+            record = launch_records[kind][file_name]
+            for rule in record['rules']:
+                if kind == 'python':
+                    rule = rule[:3] + [full_path(rule[3])]
+                remaps.remap_rule_lst.append(rule)
+            remaps.errors.extend([full_path(file_name), launch_error(error)] for error in record['errors'])
+    return model, remaps
+
+
+def extract_main(args):
+    robust = '--robust' in args
+    args = [arg for arg in args if arg != '--robust']
+    if len(args) != 3:
+        print(USAGE_TEXT)
+        return
+
+    workspace_dir = args[0]
+    input_dir = args[1]
+    limits = ExtractionLimits() if robust else None
+    try:
+        relative_path(input_dir, workspace_dir)
+    except ValueError:
+        print("Error: " + input_dir + " is not in the workspace " + workspace_dir + ".")
+        sys.exit(1)
+    shard = extract_shard(input_dir, workspace_dir, limits)
+    with open(args[2], 'w', encoding="utf-8") as file:
+        json.dump(shard, file)
+
+def merge_main(args):
+    render = '--csv' not in args
+    args = [arg for arg in args if arg != '--csv']
+    exclusion = None
+    shard_files = list()
+    for arg in args[2:]:
+        if arg.startswith('--filter='):
+            exclusion = arg[len('--filter='):]
+        else:
+            shard_files.append(arg)
+    if len(args) < 3 or not shard_files:
+        print(USAGE_TEXT)
+        return
+
+    workspace_dir = args[0]
+    out_dir_name = args[1]
+
+    shards = list()
+    for shard_file in shard_files:
+        with open(shard_file, encoding="utf-8") as file:
+            shards.append(json.load(file))
+    try:
+        model, remaps = merge_shards(shards, workspace_dir)
+    except ValueError as e:
+        print("Error: " + str(e) + ".")
+        sys.exit(1)
+    robust = shards[0]['robust']
+    if make_output_dir(out_dir_name) is None:
+        return
+    write_outputs(model, remaps, out_dir_name, exclusion, robust, render)
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('extract', 'merge'):
+        print(USAGE_TEXT)
+        return
+    if sys.argv[1] == 'extract':
+        extract_main(sys.argv[2:])
+    else:
+        merge_main(sys.argv[2:])
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@ import copy
 import csv
 import sys
 import re
+import time
+import functools
 from collections import Counter
 from pathlib import Path
-from graphviz import Digraph
-from lxml import etree
+# lxml と graphviz は起動を速くするため，必要になった時点で読み込む
 
 # 使い方
-USAGE_TEXT = """Usage: visualization.py cpp_file_dir output_dir [filter]
-[filter] is a comma-separated list of node names excluded from output."""
+USAGE_TEXT = """Usage: visualization.py [--robust] [--csv] cpp_file_dir output_dir [filter]
+[filter] is a comma-separated list of node names excluded from output.
+--robust skips files exceeding the size/time budgets or failing to parse,
+and records them in errors.csv.
+--csv writes only the csv files without rendering the graph (Graphviz is not required)."""
 
 # 対応する命令を探すための正規表現  
 # advertise<型パラメータ>( 引数 ); のように関数呼び出しを捉える
@@ -60,6 +64,115 @@ PYTHON_FILES = "**/*.py"
 
 OUTPUT_FORMAT = 'svg'
 
+# 頑健な抽出モード (--robust) の制限値
+MAX_FILE_SIZE = 1024 * 1024 # 1ファイルあたりの最大バイト数
+FILE_TIME_BUDGET = 5.0 # 1ファイルあたりの処理時間の上限 (秒)
+MAX_ARGUMENT_SPAN = 4096 # 関数呼び出しの括弧内として探索する最大文字数
+SCAN_WINDOW = 16 * 1024 # 処理時間を確認する間隔 (文字数)
+PATTERN_LITERAL_LENGTH = 64 # パターン中の固定部分 (関数名や括弧) の長さの上限
+
+
+class ExtractionError(Exception):
+    """Raised when a file exceeds a budget of the robust extraction mode."""
+
+
+class IncludeError(ExtractionError):
+    """Raised when a launch file included by another launch file cannot be analyzed.
+
+    Attribute `included_file` is the included file and `reason` describes the failure.
+    """
+
+    def __init__(self, included_file, reason):
+        super().__init__("included file " + str(included_file) + ": " + reason)
+        self.included_file = included_file
+        self.reason = reason
+
+
+class ExtractionLimits:
+    """
+    Budgets for the robust extraction mode.
+
+    Attribute `max_file_size` is the maximum size of a file in bytes.
+    Attribute `time_budget` is the maximum time in seconds to analyze a file.
+    Attribute `max_span` is the maximum length of a text matched by
+    an unbounded part (e.g. arguments of a function call) of a pattern.
+    Attribute `max_match_length` is the maximum length of a text matched by a bounded pattern,
+    which includes two bounded parts at most.
+    """
+
+    def __init__(self, max_file_size=MAX_FILE_SIZE, time_budget=FILE_TIME_BUDGET, max_span=MAX_ARGUMENT_SPAN):
+        self.max_file_size = max_file_size
+        self.time_budget = time_budget
+        self.max_span = max_span
+        self.max_match_length = 2 * max_span + PATTERN_LITERAL_LENGTH
+
+    def check_size(self, file_name):
+        size = os.path.getsize(file_name)
+        if size > self.max_file_size:
+            raise ExtractionError("file size " + str(size) + " exceeds " + str(self.max_file_size) + " bytes")
+
+    def deadline(self):
+        return time.monotonic() + self.time_budget
+
+    def bound(self, pattern_text):
+        """Returns a pattern whose unbounded repetitions are limited to `max_span` characters.
+        """
+        span = str(self.max_span)
+        return pattern_text.replace("]+", "]{1," + span + "}").replace(".*?", ".{0," + span + "}?")
+
+
+def check_deadline(deadline):
+    if deadline is not None and time.monotonic() > deadline:
+        raise ExtractionError("time budget exceeded")
+
+def scan(pattern, text, deadline=None, max_match_length=None):
+    """Iterates matches of a pattern in the same way as `pattern.finditer(text)`.
+
+    If a deadline is given, the text is searched window by window,
+    and the deadline is checked between windows even if nothing matches.
+    A match starting in a window is searched within `max_match_length` characters
+    after the window, so the result is the same as `finditer`.
+
+    :param deadline: A time.monotonic() value, or None for no limit.
+    :param max_match_length: The maximum length of a match, or None if it is unbounded.
+    """
+    if deadline is None:
+        yield from pattern.finditer(text)
+        return
+
+    pos = 0
+    while pos < len(text):
+        check_deadline(deadline)
+        window_end = min(pos + SCAN_WINDOW, len(text))
+        endpos = len(text)
+        if max_match_length is not None:
+            endpos = min(window_end + max_match_length, len(text))
+        match = pattern.search(text, pos, endpos)
+        if match is None or match.start() >= window_end:
+            pos = window_end
+            continue
+        yield match
+        pos = match.end() if match.end() > match.start() else match.end() + 1
+
+def error_reason(error):
+    """Returns a one-line description of an exception for errors.csv."""
+    return type(error).__name__ + ": " + str(error).replace("\n", " ")
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern_text, flags=0):
+    """Returns a compiled regular expression.
+
+    Each pattern is compiled once when it is used first, not at import time.
+    """
+    return re.compile(pattern_text, flags)
+
+def find_files(input_dir, pattern):
+    """Returns files matching a glob pattern under the directory in a sorted order.
+
+    The order is fixed so that outputs do not depend on the file system.
+    """
+    return sorted(Path(input_dir).glob(pattern))
+
 def get_topic(lst: str):
     """Get a topic name from a code fragment. 
 
@@ -70,15 +183,15 @@ def get_topic(lst: str):
         e.g. arguments of a subscribe function call.
     :returns: A pair of a topic name and a flag representing'literal' or 'non-literal'.
     """
-    match = re.search(TOPIC_PATTERN, lst)
-    non_match = re.search(NON_LITERAL_TOPIC_PATTERN, lst)
+    match = compile_pattern(TOPIC_PATTERN).search(lst)
+    non_match = compile_pattern(NON_LITERAL_TOPIC_PATTERN).search(lst)
     if match:
         return match.group(1), 'literal'
     elif non_match:
         return non_match.group(1), 'non_literal'
     return None, None
 
-def get_topics(text: str, patterns: list, file_name: str):
+def get_topics(text: str, patterns: list, file_name: str, deadline=None, max_match_length=None):
     """Find publish/subscriber patterns in source code.
 
     This function checks subscribe/publish function call patterns
@@ -90,6 +203,9 @@ def get_topics(text: str, patterns: list, file_name: str):
         This function identifies identify a topic name from the part.
     :param file_name: A source file name. 
         This is included in the resultant list.
+    :param deadline: A time.monotonic() value.  
+        ExtractionError is raised if the analysis does not finish by the time.
+    :param max_match_length: The maximum length of a match of the patterns, if they are bounded.
     :returns: A pair of identified topics and a list of source code locations.
         The identified topics is a set of strings.
         The source code locations is a list of tuples including four elements 
@@ -98,14 +214,15 @@ def get_topics(text: str, patterns: list, file_name: str):
     topics = set()
     match_text = list()
     for pattern_text in patterns:
-        pattern = re.compile(pattern_text, re.DOTALL)
-        for match in pattern.finditer(text):
+        pattern = compile_pattern(pattern_text, re.DOTALL)
+        for match in scan(pattern, text, deadline, max_match_length):
             topic, topic_type = get_topic(match.group('param'))
             if topic:
                 topics.add(topic)
                 match_text.append([file_name, match.start(), match.group(), topic])
             else:
                 match_text.append([file_name, match.start(), match.group(), ""])
+            check_deadline(deadline)
     return topics, match_text
 
 
@@ -119,20 +236,46 @@ class Node:
     Attribute `locations` keeps a list of  locations of publish/subscribe function calls
     """
 
-    def __init__(self, file_name):
+    def __init__(self, file_name, limits=None):
         """Create a Node from the content of a source file
+
+        If ExtractionLimits is given, the budgets are applied to the file.
         """
         self.file_name = file_name
         self.name = os.path.splitext(os.path.basename(file_name))[0] # ファイル名からnode名を取得
         self.publishing_topics = set()
         self.subscribing_topics = set()
         self.locations = list()
+        publish_patterns = PUBLISH_PATTERNS
+        subscribe_patterns = SUBSCRIBE_PATTERNS
+        deadline = None
+        max_match_length = None
+        if limits:
+            limits.check_size(file_name)
+            publish_patterns = [limits.bound(pattern) for pattern in PUBLISH_PATTERNS]
+            subscribe_patterns = [limits.bound(pattern) for pattern in SUBSCRIBE_PATTERNS]
+            deadline = limits.deadline()
+            max_match_length = limits.max_match_length
         with open(file_name, encoding="utf-8") as file:
             text = file.read()
-            self.publishing_topics, pub_locations = get_topics(text, PUBLISH_PATTERNS, file_name)
-            self.subscribing_topics, sub_locations = get_topics(text, SUBSCRIBE_PATTERNS, file_name)
+            self.publishing_topics, pub_locations = get_topics(text, publish_patterns, file_name,
+                                                               deadline, max_match_length)
+            self.subscribing_topics, sub_locations = get_topics(text, subscribe_patterns, file_name,
+                                                                deadline, max_match_length)
             self.locations = pub_locations + sub_locations
 
+    @classmethod
+    def from_record(cls, file_name, publishing_topics, subscribing_topics, locations):
+        """Create a Node from an analysis result recorded by a shard without reading the file
+        """
+        node = cls.__new__(cls)
+        node.file_name = file_name
+        node.name = os.path.splitext(os.path.basename(file_name))[0]
+        node.publishing_topics = set(publishing_topics)
+        node.subscribing_topics = set(subscribing_topics)
+        node.locations = locations
+        return node
+
 
 class RosGraph:
     """
@@ -142,17 +285,29 @@ class RosGraph:
     Each node is identified by the file name.
     `published_topics` and `subscribed_topics` count the number of nodes 
     publishing/subscribing a topic.
+    If ExtractionLimits is given, files that cannot be analyzed are skipped
+    and recorded in `errors` as pairs (file name, reason).
     """
 
-    def __init__(self, files):
+    def __init__(self, files, limits=None):
         self.nodes = list()
         self.published_topics = Counter()
         self.subscribed_topics = Counter()
+        self.errors = list()
         for file_name in files:
-            node = Node(file_name)
-            self.nodes.append(node)
-            self.published_topics.update(node.publishing_topics)
-            self.subscribed_topics.update(node.subscribing_topics)
+            try:
+                node = Node(file_name, limits)
+            except Exception as e:
+                if limits is None:
+                    raise
+                self.errors.append([file_name, error_reason(e)])
+                continue
+            self.add_node(node)
+
+    def add_node(self, node):
+        self.nodes.append(node)
+        self.published_topics.update(node.publishing_topics)
+        self.subscribed_topics.update(node.subscribing_topics)
     
     def get_pub_lst(self):
         """Returns a list of node-topic pairs in the graph.
@@ -161,7 +316,7 @@ class RosGraph:
         """
         pub_lst = list() # [node,topic]
         for node in self.nodes:
-            for topic_name in node.publishing_topics: 
+            for topic_name in sorted(node.publishing_topics): 
                 pub_lst.append([node.name, topic_name])
 
         #non_connect_pub_out = r"C:\Users\mrtyu\Desktop\output7\pub.csv"
@@ -179,7 +334,7 @@ class RosGraph:
         """
         sub_lst = list() # [topic,node]
         for node in self.nodes:
-            for topic_name in node.subscribing_topics: # ファイル内のsubを[topic,node]で格納
+            for topic_name in sorted(node.subscribing_topics): # ファイル内のsubを[topic,node]で格納
                 sub_lst.append([topic_name, node.name])
         return sub_lst
     
@@ -191,7 +346,7 @@ class RosGraph:
         unsubscribed_topics = self.published_topics.keys() - self.subscribed_topics.keys()
         unsubscribed_topic_pulishers = list()
         for node in self.nodes:
-            for topic_name in (node.publishing_topics & unsubscribed_topics):
+            for topic_name in sorted(node.publishing_topics & unsubscribed_topics):
                 unsubscribed_topic_pulishers.append([topic_name, node.name, node.file_name])
         return unsubscribed_topic_pulishers
     
@@ -203,20 +358,54 @@ class RosGraph:
         unpublished_topics = self.subscribed_topics.keys() - self.published_topics.keys()
         unpublished_topic_subscribers = list()
         for node in self.nodes:
-            for topic_name in (node.subscribing_topics & unpublished_topics):
+            for topic_name in sorted(node.subscribing_topics & unpublished_topics):
                 unpublished_topic_subscribers.append([topic_name, node.name, node.file_name])
         return unpublished_topic_subscribers
 
 
 
 class Remap:
-    def __init__(self, xml_files, python_files, files):
+    """
+    Remap rules extracted from launch files.
+
+    Attribute `remap_rule_lst` is a list of (node, original topic, new topic, source).
+    If ExtractionLimits is given, launch files that cannot be analyzed are skipped
+    and recorded in `errors` as pairs (file name, reason).
+    Attribute `include_errors` maps a file skipped because of its included file to the IncludeError.
+    """
+
+    def __init__(self, xml_files, python_files, files, limits=None):
         self.remap_rule_lst = list()
+        self.limits = limits
+        self.deadline = None
+        self.errors = list()
+        self.include_errors = dict()
 
         for xml_file in xml_files:
-            self.xml_reader(xml_file, files)
+            self.read_file(self.xml_reader, xml_file, files)
         for python_file in python_files:
-            self.python_reader(python_file)
+            self.read_file(self.python_reader, python_file)
+
+    def read_file(self, reader, path, *args):
+        """Calls a reader for a launch file.
+
+        In the robust mode, rules extracted from a file are discarded
+        if the reader fails in the middle of the file.
+        The time budget of the file includes the files included by it.
+        """
+        rule_count = len(self.remap_rule_lst)
+        try:
+            if self.limits:
+                self.limits.check_size(path)
+                self.deadline = self.limits.deadline()
+            reader(path, *args)
+        except Exception as e:
+            if self.limits is None:
+                raise
+            del self.remap_rule_lst[rule_count:]
+            self.errors.append([path, error_reason(e)])
+            if isinstance(e, IncludeError):
+                self.include_errors[path] = e
     
     def xml_reader(self, path, files):
         default_rule = list()
@@ -226,8 +415,11 @@ class Remap:
         ref_flag = 0
         sec_ref_flag = 0
 
+        from lxml import etree
+
         with open(path, encoding="utf-8") as xml_file:
             tree = etree.parse(xml_file) 
+        check_deadline(self.deadline)
 
         #defaultの取得
         args = tree.xpath('/launch/arg')
@@ -310,7 +502,7 @@ class Remap:
         if remaps:
             for remap in remaps:
                 original = remap.attrib["to"]
-                match = re.search(XML_DEFAULT, remap.attrib["to"])
+                match = compile_pattern(XML_DEFAULT).search(remap.attrib["to"])
 
                 if match:
                     original = match.group('param')
@@ -330,7 +522,7 @@ class Remap:
         if len(set_remaps):
             for set_remap in set_remaps:
                 original = set_remap.attrib["to"]
-                match = re.search(XML_DEFAULT, set_remap.attrib["to"])
+                match = compile_pattern(XML_DEFAULT).search(set_remap.attrib["to"])
 
                 if match:
                     original = match.group('param')
@@ -392,8 +584,8 @@ class Remap:
 
         for ref in refs:
             ref_file = ref.attrib["file"]
-            ref_match = re.search(REF_FILE, ref_file)
-            match = re.search(REF_XML, ref_match.group('param'))
+            ref_match = compile_pattern(REF_FILE).search(ref_file)
+            match = compile_pattern(REF_XML).search(ref_match.group('param'))
 
             if match:
                 ref_flag = 1
@@ -410,9 +602,21 @@ class Remap:
             return ref_default_rules, ref_flag, ref_files
 
     def add_include_remap(self, ref_files, ref_default_rules):
+        from lxml import etree
+
         for ref_file in ref_files:
-            with open(ref_file, encoding="utf-8") as ref_xml_file:
-                ref_tree = etree.parse(ref_xml_file)
+            check_deadline(self.deadline)
+            try:
+                if self.limits:
+                    self.limits.check_size(ref_file)
+                with open(ref_file, encoding="utf-8") as ref_xml_file:
+                    ref_tree = etree.parse(ref_xml_file)
+            except Exception as e:
+                if self.limits is None:
+                    raise
+                # 原因となった include 先のファイルを理由に含める
+                raise IncludeError(ref_file, error_reason(e))
+            check_deadline(self.deadline)
             
             ref_remap_path = self.check_ref_path(ref_tree, '/launch')
             if ref_remap_path:
@@ -420,7 +624,7 @@ class Remap:
 
                 if len(ref_remaps):
                     for ref_remap in ref_remaps:
-                        match = re.search(XML_DEFAULT, ref_remap.attrib["to"])
+                        match = compile_pattern(XML_DEFAULT).search(ref_remap.attrib["to"])
                         if match:
                             original = match.group('param')
                             for ref_default_rule in ref_default_rules:
@@ -431,31 +635,41 @@ class Remap:
         with open(path, encoding="utf-8") as file:
                 text = file.read()
 
-        func_pattern = re.compile(REMAP_FUNCTION_PATTERN, re.DOTALL)
-        func_node_pattern = re.compile(REMAP_NODE_FUNCTION_PATTERN, re.DOTALL)
+        func_pattern_text = REMAP_FUNCTION_PATTERN
+        func_node_pattern_text = REMAP_NODE_FUNCTION_PATTERN
+        max_match_length = None
+        if self.limits:
+            func_pattern_text = self.limits.bound(func_pattern_text)
+            func_node_pattern_text = self.limits.bound(func_node_pattern_text)
+            max_match_length = self.limits.max_match_length
 
-        for func_text in func_pattern.finditer(text):
+        func_pattern = compile_pattern(func_pattern_text, re.DOTALL)
+        func_node_pattern = compile_pattern(func_node_pattern_text, re.DOTALL)
+
+        for func_text in scan(func_pattern, text, self.deadline, max_match_length):
             self.make_remap_rules(func_text.group(),path) 
+            check_deadline(self.deadline)
 
-        for func_text in func_node_pattern.finditer(text):
+        for func_text in scan(func_node_pattern, text, self.deadline, max_match_length):
             self.make_remap_rules(func_text.group(),path)        
+            check_deadline(self.deadline)
     
     def make_remap_rules(self, text,path):
-        name = re.search(NAME_PATTERN, text)
+        name = compile_pattern(NAME_PATTERN).search(text)
 
         if name:
-            pattern = re.compile(REMAPPINGS_PATTERN, re.DOTALL)
+            pattern = compile_pattern(REMAPPINGS_PATTERN, re.DOTALL)
             for remappings in pattern.finditer(text):
                 if remappings:
                     self.get_remap_rules(remappings.group(), name.group('node'),path)
     
     def get_remap_rules(self, text, node,path):
         
-        if re.search(REMAP_PATTERN, text):
-            pattern = re.compile(REMAP_PATTERN, re.DOTALL)
+        if compile_pattern(REMAP_PATTERN).search(text):
+            pattern = compile_pattern(REMAP_PATTERN, re.DOTALL)
             for match in pattern.finditer(text):
-                lc_match = re.search(PYTHON_REMAP_LaunchConfiguration, match.group('new'))
-                not_lc_match = re.search(PYTHON_REMAP_NOT_LaunchConfiguration, match.group('new'))
+                lc_match = compile_pattern(PYTHON_REMAP_LaunchConfiguration).search(match.group('new'))
+                not_lc_match = compile_pattern(PYTHON_REMAP_NOT_LaunchConfiguration).search(match.group('new'))
 
                 if lc_match:
                     new_topic = '/' + lc_match.group(1)
@@ -463,18 +677,18 @@ class Remap:
                 elif not_lc_match:
                     self.remap_rule_lst.append([node, match.group('original'), not_lc_match.group(1), path])
 
-"""
-[publisher-node, topic, subscriber-node の並び] のリストを返す
-"""
-def make_output_list(model, remaps): # テキスト化のためのリスト作成関数
-    pub_list = list()
-    sub_list = list()
-    remap_list = list()
-    output_list = list()
+def apply_remaps(model, remaps):
+    """Returns node-topic pairs of the graph after remap rules are applied.
 
+    :param model: A RosGraph instance.
+    :param remaps: A Remap instance.
+    :returns: A pair of a publisher list of [node, topic] and
+        a subscriber list of [topic, node].
+        A remapped topic is appended to the lists in addition to the original one.
+    """
     pub_list = model.get_pub_lst()
     sub_list = model.get_sub_lst()
-    remap_list = remaps.remap_rule_lst
+    remap_list = list(remaps.remap_rule_lst)
 
     #pubのremap
     for pub in pub_list:
@@ -491,7 +705,16 @@ def make_output_list(model, remaps): # テキスト化のためのリスト作
             if sub[0] == remap[1]:
                 sub_list.append([remap[2], sub[1]])
                 remap_list.remove(remap)
-    
+
+    return pub_list, sub_list
+
+"""
+[publisher-node, topic, subscriber-node の並び] のリストを返す
+"""
+def make_output_list(model, remaps): # テキスト化のためのリスト作成関数
+    output_list = list()
+    pub_list, sub_list = apply_remaps(model, remaps)
+
     for pub in pub_list:
         output = list()
 
@@ -535,6 +758,8 @@ def del_element(lst, exclusion):
     return lst
 
 def make_graph(lst, out_dir_name): # グラフ出力関数
+    from graphviz import Digraph
+
     dg = Digraph(format=OUTPUT_FORMAT)
     dg.attr(rankdir='LR') # グラフを横向きに出力
     lst_count = 0
@@ -579,29 +804,42 @@ def make_graph(lst, out_dir_name): # グラフ出力関数
         lst_count = 0
     dg.render("connect_graph", out_dir_name, view=False) #ファイル出力
 
-def main():
-    if len(sys.argv) < 3 or len(sys.argv) > 4:
-        print(USAGE_TEXT)
-        return
-    
-    cpp_files = Path(sys.argv[1]).glob(CPP_FILES)
-    out_dir_name = sys.argv[2]
-    exclusion = sys.argv[3] if len(sys.argv)==4 else None
+def make_output_dir(out_dir_name):
+    """Creates the output directory if it does not exist.
+
+    :returns: The directory as a Path, or None if the path is not a directory.
+    """
     out_dir = Path(out_dir_name)
     if out_dir.exists():
         if not out_dir.is_dir():
             print("Error: " + out_dir_name + " is not a directory.")
-            return
+            return None
     else:
         out_dir.mkdir(parents=True)
-    
-    model = RosGraph(cpp_files)
+    return out_dir
 
-    #launchファイル名
-    xml_files = Path(sys.argv[1]).glob(XML_FILES)
-    python_files = Path(sys.argv[1]).glob(PYTHON_FILES)
+def write_errors(model, remaps, out_dir_name):
+    """Writes files skipped in the robust mode and the reasons to errors.csv."""
+    errors_out = Path(out_dir_name) / "errors.csv"
+    with open(errors_out, 'w') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(['File', 'Reason'])
+        writer.writerows(model.errors + remaps.errors)
+
+def write_outputs(model, remaps, out_dir_name, exclusion=None, robust=False, render=True):
+    """Writes the csv files and the graph of the analysis result to the directory.
+
+    :param model: A RosGraph instance.
+    :param remaps: A Remap instance.
+    :param out_dir_name: An existing output directory.
+    :param exclusion: A comma-separated list of node names excluded from the graph.
+    :param robust: If True, errors.csv is also written.
+    :param render: If False, the graph is not rendered and graphviz is not imported.
+    """
+    out_dir = Path(out_dir_name)
 
-    remaps = Remap(xml_files, python_files, sys.argv[1])
+    if robust:
+        write_errors(model, remaps, out_dir_name)
 
     remap_out = out_dir / "remap.csv"
     with open(remap_out, 'w') as file:
@@ -638,9 +876,36 @@ def main():
         writer.writerows(model.get_unpublished_topic_subscribers())
 
 
+    if not render:
+        return
     if exclusion:
         output_lst = del_element(output_lst, exclusion)
     make_graph(output_lst, out_dir_name)
 
+def main():
+    robust = '--robust' in sys.argv
+    render = '--csv' not in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg not in ('--robust', '--csv')]
+    if len(args) < 2 or len(args) > 3:
+        print(USAGE_TEXT)
+        return
+    
+    input_dir = args[0]
+    out_dir_name = args[1]
+    exclusion = args[2] if len(args)==3 else None
+    limits = ExtractionLimits() if robust else None
+    if make_output_dir(out_dir_name) is None:
+        return
+    
+    model = RosGraph(find_files(input_dir, CPP_FILES), limits)
+
+    #launchファイル名
+    xml_files = find_files(input_dir, XML_FILES)
+    python_files = find_files(input_dir, PYTHON_FILES)
+
+    remaps = Remap(xml_files, python_files, input_dir, limits)
+
+    write_outputs(model, remaps, out_dir_name, exclusion, robust, render)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file